@@ -0,0 +1,113 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass
+class JsonKeyConfig:
+    """A key extracted from a JSON column."""
+    path: str
+    output_name: str
+    type: str = 'string'
+
+@dataclass
+class ColumnConfig:
+    """A column selected from the source table."""
+    name: str
+    type: str
+    output_name: str
+    data_type: Optional[str] = None
+    format: Optional[str] = None
+    keys: Optional[List[JsonKeyConfig]] = None
+    
+    @classmethod
+    def from_dict(cls, config: Dict) -> 'ColumnConfig':
+        """
+        Build a column configuration from its JSON dictionary.
+        
+        Args:
+            config: Column configuration dictionary
+        
+        Returns:
+            ColumnConfig: Parsed column configuration
+        """
+        name = config['name']
+        output_name = config.get('output_name', name)
+        
+        keys = None
+        if 'keys' in config:
+            keys = []
+            for key_config in config['keys']:
+                # Handle both string and dictionary key configurations
+                if isinstance(key_config, str):
+                    key_path = key_config
+                    keys.append(JsonKeyConfig(key_path, f"{output_name}_{key_path.replace('.', '_')}"))
+                else:
+                    key_path = key_config['path']
+                    keys.append(JsonKeyConfig(
+                        key_path,
+                        key_config.get('output_name', f"{output_name}_{key_path.replace('.', '_')}"),
+                        key_config.get('type', 'string')
+                    ))
+        
+        return cls(
+            name=name,
+            type=config['type'],
+            output_name=output_name,
+            data_type=config.get('data_type'),
+            format=config.get('format'),
+            keys=keys
+        )
+
+@dataclass
+class WhereCondition:
+    """A single condition of the WHERE clause."""
+    column: str
+    operator: str
+    value: Any
+    
+    @classmethod
+    def from_dict(cls, config: Dict) -> 'WhereCondition':
+        """
+        Build a WHERE condition from its JSON dictionary.
+        
+        Args:
+            config: Where item dictionary holding a 'condition' entry
+        
+        Returns:
+            WhereCondition: Parsed condition
+        """
+        condition = config['condition']
+        return cls(condition['column'], condition['operator'], condition['value'])
+
+@dataclass
+class ExtractConfig:
+    """Extract configuration, parsed and validated once before extraction."""
+    source: Dict
+    columns: List[ColumnConfig]
+    where: List[WhereCondition] = field(default_factory=list)
+    order_by: List[Dict] = field(default_factory=list)
+    limit: Optional[Dict] = None
+    
+    @classmethod
+    def from_dict(cls, config: Dict) -> 'ExtractConfig':
+        """
+        Build an extract configuration from its JSON dictionary.
+        
+        Args:
+            config: Extract configuration dictionary
+        
+        Returns:
+            ExtractConfig: Parsed extract configuration
+        
+        Raises:
+            ValueError: If a required setting is missing
+        """
+        try:
+            return cls(
+                source=config['source'],
+                columns=[ColumnConfig.from_dict(col) for col in config['columns']],
+                where=[WhereCondition.from_dict(item) for item in config.get('where', [])],
+                order_by=config.get('order_by', []),
+                limit=config.get('limit')
+            )
+        except KeyError as e:
+            raise ValueError(f"Missing required extract setting: {e}") from e
@@ -1,63 +1,60 @@
 import pandas as pd
-import mysql.connector
+from mysql.connector import errors, pooling
 from typing import Dict, List, Union
 import json
+import logging
 from datetime import datetime
 import numpy as np
+from urllib.parse import quote_plus
+from .extractConfig import ColumnConfig, ExtractConfig
 
-def get_nested_value(data: Dict, key_path: str) -> any:
-    """
-    Get value from nested dictionary using dot notation.
-    
-    Args:
-        data: Dictionary to extract value from
-        key_path: Path to the value using dot notation (e.g., 'person.age')
-    
-    Returns:
-        The value at the specified path or None if not found
-    """
-    if not data:
-        return None
-        
-    keys = key_path.split('.')
-    current = data
-    
-    for key in keys:
-        if isinstance(current, dict) and key in current:
-            current = current[key]
-        else:
-            return None
-            
-    return current
+try:
+    import connectorx as cx
+except ImportError:  # ConnectorX is optional, fall back to a plain cursor
+    cx = None
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    json_loads = json.loads
+
+try:
+    import pyarrow  # noqa: F401
+    # Arrow-backed strings share one contiguous buffer instead of a Python object per value
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:  # pyarrow is optional, keep object columns
+    STRING_DTYPE = None
+
+logger = logging.getLogger(__name__)
+
+# Number of rows pulled per round-trip when ConnectorX is not available
+FETCH_BATCH_SIZE = 10_000
 
-def build_where_clause(conditions: List[Dict]) -> str:
+# Default number of connections kept open per MySQL source
+DEFAULT_POOL_SIZE = 10
+
+# Connection pools cached per (host, port, database, user)
+_connection_pools = {}
+
+def build_select_list(columns: List[ColumnConfig]) -> str:
     """
-    Build WHERE clause from conditions.
+    Build the SELECT list, extracting configured JSON keys inside MySQL.
     
     Args:
-        conditions: List of condition dictionaries
+        columns: List of column configurations
     
     Returns:
-        str: WHERE clause string
+        str: Comma separated SELECT expressions
     """
-    if not conditions:
-        return ""
-        
-    where_parts = []
-    for condition in conditions:
-        column = condition['column']
-        operator = condition['operator']
-        value = condition['value']
-        
-        # Handle different value types
-        if isinstance(value, str):
-            value = f"'{value}'"
-        elif value is None:
-            value = "NULL"
-            
-        where_parts.append(f"{column} {operator} {value}")
-    
-    return " WHERE " + " AND ".join(where_parts)
+    select_parts = []
+    for col_config in columns:
+        if col_config.type == 'json' and col_config.keys is not None:
+            for key_config in col_config.keys:
+                select_parts.append(f"JSON_EXTRACT({col_config.name}, \"$.{key_config.path}\") AS `{key_config.output_name}`")
+        else:
+            select_parts.append(col_config.name)
+    return ', '.join(select_parts)
 
 def build_order_by_clause(order_by: List[Dict]) -> str:
     """
@@ -103,183 +100,295 @@ def build_limit_clause(limit: Dict) -> str:
         return f" LIMIT {offset}, {count}"
     return f" LIMIT {count}"
 
-def extract_from_mysql(config: Dict) -> pd.DataFrame:
+def build_connection_uri(mysql_config: Dict) -> str:
+    """
+    Build a MySQL connection URI for ConnectorX.
+    
+    Args:
+        mysql_config: Dictionary containing MySQL connection details
+    
+    Returns:
+        str: Connection URI string
+    """
+    user = quote_plus(str(mysql_config['user']))
+    password = quote_plus(str(mysql_config['password']))
+    return (f"mysql://{user}:{password}@{mysql_config['host']}:"
+            f"{mysql_config['port']}/{mysql_config['database']}")
+
+def get_connection_pool(mysql_config: Dict) -> pooling.MySQLConnectionPool:
+    """
+    Get the connection pool for a MySQL source, creating it on first use.
+    
+    Args:
+        mysql_config: Dictionary containing MySQL connection details
+    
+    Returns:
+        pooling.MySQLConnectionPool: Pool of connections to the source, opened on demand
+    """
+    pool_key = (mysql_config['host'], mysql_config['port'],
+                mysql_config['database'], mysql_config['user'])
+    pool = _connection_pools.get(pool_key)
+    if pool is None:
+        # Without connection arguments the pool starts empty instead of opening pool_size connections
+        pool = pooling.MySQLConnectionPool(
+            pool_name=f"etl_{len(_connection_pools)}",
+            pool_size=mysql_config.get('pool_size', DEFAULT_POOL_SIZE)
+        )
+        pool.set_config(
+            host=mysql_config['host'],
+            port=mysql_config['port'],
+            database=mysql_config['database'],
+            user=mysql_config['user'],
+            password=mysql_config['password'],
+            use_pure=False
+        )
+        _connection_pools[pool_key] = pool
+    return pool
+
+def get_pooled_connection(mysql_config: Dict):
+    """
+    Check out a connection for a MySQL source, opening a new one while the pool has room.
+    
+    Args:
+        mysql_config: Dictionary containing MySQL connection details
+    
+    Returns:
+        Pooled connection; closing it returns it to the pool
+    """
+    pool = get_connection_pool(mysql_config)
+    try:
+        return pool.get_connection()
+    except errors.PoolError:
+        # No idle connection, grow the pool up to pool_size
+        pool.add_connection()
+        return pool.get_connection()
+
+def read_query(query: str, params: List, mysql_config: Dict) -> pd.DataFrame:
+    """
+    Run a query and load the result set into a DataFrame.
+    
+    Uses ConnectorX when installed, which decodes the result set column-wise
+    without building a Python object per row. ConnectorX cannot bind
+    parameters, so parameterized queries and installs without ConnectorX use
+    an unbuffered cursor that fetches FETCH_BATCH_SIZE rows per round-trip.
+    
+    Args:
+        query: SQL query to execute, with %s placeholders for params
+        params: Values bound to the query placeholders
+        mysql_config: Dictionary containing MySQL connection details
+    
+    Returns:
+        pd.DataFrame: Query result
+    """
+    if cx is not None and not params:
+        return cx.read_sql(build_connection_uri(mysql_config), query, return_type="pandas")
+    
+    connection = get_pooled_connection(mysql_config)
+    try:
+        cursor = connection.cursor(buffered=False)
+        cursor.arraysize = FETCH_BATCH_SIZE
+        try:
+            cursor.execute(query, params or None)
+            columns = cursor.column_names
+            chunks = []
+            while True:
+                rows = cursor.fetchmany(cursor.arraysize)
+                if not rows:
+                    break
+                chunks.append(pd.DataFrame.from_records(rows, columns=columns))
+        finally:
+            cursor.close()
+    finally:
+        # Return the connection to the pool
+        connection.close()
+    
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks, ignore_index=True)
+
+def convert_columns(df: pd.DataFrame, column_pairs: List[tuple], converter,
+                    dtype: str = None, **kwargs) -> Dict[str, pd.Series]:
+    """
+    Convert a group of columns with a single DataFrame.apply call.
+    
+    Args:
+        df: DataFrame holding the source columns
+        column_pairs: List of (source_column, output_column) tuples
+        converter: Function applied to each source column (e.g., pd.to_numeric)
+        dtype: Optional dtype the converted columns are cast to
+        **kwargs: Extra keyword arguments passed to the converter
+    
+    Returns:
+        Dict mapping each output column name to its converted Series
+    """
+    if not column_pairs:
+        return {}
+    
+    source_columns = list(dict.fromkeys(source for source, _ in column_pairs))
+    converted = df[source_columns].apply(converter, **kwargs)
+    if dtype is not None:
+        converted = converted.astype(dtype)
+    
+    return {output: converted[source] for source, output in column_pairs}
+
+def extract_from_mysql(config: ExtractConfig) -> pd.DataFrame:
     """
     Extract data from MySQL database based on configuration.
     
     Args:
-        config: Dictionary containing MySQL connection and column configuration
+        config: Parsed extract configuration with MySQL connection and column settings
     
     Returns:
         pd.DataFrame: Extracted data as a pandas DataFrame
     """
     # Extract MySQL connection details
-    mysql_config = config['source']
-    connection = mysql.connector.connect(
-        host=mysql_config['host'],
-        port=mysql_config['port'],
-        database=mysql_config['database'],
-        user=mysql_config['user'],
-        password=mysql_config['password']
-    )
+    mysql_config = config.source
     
-    try:
-        # First, let's check if the table exists and has data
-        cursor = connection.cursor(dictionary=True)
-        test_query = f"SELECT COUNT(*) as count FROM {mysql_config['table']}"
-        print("Executing test query:", test_query)
-        cursor.execute(test_query)
-        result = cursor.fetchone()
-        print(f"Number of rows in table: {result['count']}")
-        
-        # Get column names and types
-        columns = config['columns']
-        column_names = [col['name'] for col in columns]
-        
-        # Build the base SELECT query
-        query = f"SELECT {', '.join(column_names)} FROM {mysql_config['table']}"
+    # Get column names and types
+    columns = config.columns
+    
+    # Build the base SELECT query
+    query = f"SELECT {build_select_list(columns)} FROM {mysql_config['table']}"
+    
+    # Values referenced by the query placeholders
+    params = []
+    
+    # Add WHERE clause if conditions are specified
+    if config.where:
+        # Index JSON keys by output name so each condition is a single lookup
+        json_key_index = {
+            key_config.output_name: (col_config.name, key_config)
+            for col_config in columns
+            if col_config.type == 'json' and col_config.keys
+            for key_config in col_config.keys
+        }
         
-        # Add WHERE clause if conditions are specified
-        if 'where' in config:
-            where_parts = []
-            for where_item in config['where']:
-                condition = where_item['condition']
-                column = condition['column']
-                operator = condition['operator']
-                value = condition['value']
-                
-                # Check if this is a JSON field condition
-                json_field = None
-                for col_config in columns:
-                    if col_config['type'] == 'json' and 'keys' in col_config:
-                        for key_config in col_config['keys']:
-                            if isinstance(key_config, dict) and key_config.get('output_name') == column:
-                                json_field = {
-                                    'column': col_config['name'],
-                                    'path': key_config['path']
-                                }
-                                break
-                
-                # Handle different value types
-                if isinstance(value, str):
-                    # For JSON numeric fields, don't quote the value
-                    if json_field and any(key_config.get('output_name') == column and 
-                                        key_config.get('type', 'string') == 'numeric' 
-                                        for col_config in columns 
-                                        for key_config in col_config.get('keys', [])):
-                        value = value  # Keep as unquoted number
-                    else:
-                        value = f"'{value}'"
-                elif value is None:
-                    value = "NULL"
-                
-                # If it's a JSON field, use JSON_EXTRACT with double quotes for the path
-                if json_field:
-                    # For numeric JSON fields, use CAST to ensure proper comparison
-                    if any(key_config.get('output_name') == column and 
-                          key_config.get('type', 'string') == 'numeric' 
-                          for col_config in columns 
-                          for key_config in col_config.get('keys', [])):
-                        where_parts.append(f"CAST(JSON_EXTRACT({json_field['column']}, \"$.{json_field['path']}\") AS DECIMAL(10,2)) {operator} {value}")
-                    else:
-                        where_parts.append(f"JSON_EXTRACT({json_field['column']}, \"$.{json_field['path']}\") {operator} {value}")
-                else:
-                    where_parts.append(f"{column} {operator} {value}")
+        where_parts = []
+        for condition in config.where:
+            column = condition.column
+            operator = condition.operator
+            value = condition.value
             
-            if where_parts:
-                query += " WHERE " + " AND ".join(where_parts)
-        
-        # Add ORDER BY clause if specified
-        if 'order_by' in config:
-            query += build_order_by_clause(config['order_by'])
+            # Check if this is a JSON field condition
+            json_field = json_key_index.get(column)
+            is_numeric_json = json_field is not None and json_field[1].type == 'numeric'
+            
+            # Values are bound by the driver, which handles quoting and NULL
+            params.append(value)
+            
+            # If it's a JSON field, use JSON_EXTRACT with double quotes for the path
+            if json_field:
+                json_column, key_config = json_field
+                json_path = key_config.path
+                # For numeric JSON fields, use CAST to ensure proper comparison
+                if is_numeric_json:
+                    where_parts.append(f"CAST(JSON_EXTRACT({json_column}, \"$.{json_path}\") AS DECIMAL(10,2)) {operator} %s")
+                else:
+                    where_parts.append(f"JSON_EXTRACT({json_column}, \"$.{json_path}\") {operator} %s")
+            else:
+                where_parts.append(f"{column} {operator} %s")
         
-        # Add LIMIT clause if specified
-        if 'limit' in config:
-            query += build_limit_clause(config['limit'])
+        if where_parts:
+            query += " WHERE " + " AND ".join(where_parts)
+    
+    # Add ORDER BY clause if specified
+    query += build_order_by_clause(config.order_by)
+    
+    # Add LIMIT clause if specified
+    query += build_limit_clause(config.limit)
+    
+    # Log the query for debugging
+    logger.debug("Executing SQL query: %s with params %s", query, params)
+    
+    # Execute query and load the result into a DataFrame
+    df = read_query(query, params, mysql_config)
+    logger.debug("Number of rows returned: %d", len(df))
+    
+    # Log column names and first few rows for debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Available columns in DataFrame: %s", df.columns.tolist())
+        if not df.empty:
+            logger.debug("First few rows of data:\n%s", df.head())
+        else:
+            logger.debug("No data returned from query!")
+    
+    # Output columns in configuration order, assembled into a new DataFrame at the end
+    result = {}
+    
+    # Typed columns are collected as (source, output) pairs and converted per dtype group
+    date_groups = {}
+    int_columns = []
+    float_columns = []
+    
+    # Map lower-cased names to the actual DataFrame column names
+    col_by_lower = {col.lower(): col for col in df.columns}
+    
+    # Process each column based on its type
+    for col_config in columns:
+        col_name = col_config.name
+        col_type = col_config.type
+        output_name = col_config.output_name
         
-        # Print the query for debugging
-        print("Executing SQL query:", query)
+        # JSON keys were extracted by MySQL, decode the returned JSON values
+        if col_type == 'json' and col_config.keys is not None:
+            for key_config in col_config.keys:
+                new_col_name = key_config.output_name
+                if new_col_name in df.columns:
+                    # SQL NULLs may arrive as None or NaN depending on the pandas version
+                    result[new_col_name] = [json_loads(x) if isinstance(x, (str, bytes, bytearray)) else None
+                                            for x in df[new_col_name].values]
+            continue
         
-        # Execute query and fetch data
-        cursor.execute(query)
-        data = cursor.fetchall()
+        # Find the actual column name in the DataFrame (case-insensitive)
+        actual_col_name = col_by_lower.get(col_name.lower())
+        if actual_col_name is None:
+            logger.warning("Column '%s' not found in DataFrame. Available columns: %s",
+                           col_name, df.columns.tolist())
+            continue
         
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
+        if col_type == 'date':
+            date_groups.setdefault(col_config.format, []).append((actual_col_name, output_name))
+            result[output_name] = None  # filled in after conversion
         
-        # Print column names and first few rows for debugging
-        print("\nAvailable columns in DataFrame:", df.columns.tolist())
-        if not df.empty:
-            print("\nFirst few rows of data:")
-            print(df.head())
-        else:
-            print("\nNo data returned from query!")
+        elif col_type == 'numeric':
+            if col_config.data_type == 'int':
+                int_columns.append((actual_col_name, output_name))
+            else:  # float
+                float_columns.append((actual_col_name, output_name))
+            result[output_name] = None  # filled in after conversion
         
-        # Process each column based on its type
-        for col_config in columns:
-            col_name = col_config['name']
-            col_type = col_config['type']
-            output_name = col_config.get('output_name', col_name)
-            
-            # Find the actual column name in the DataFrame (case-insensitive)
-            actual_col_name = next((col for col in df.columns if col.lower() == col_name.lower()), None)
-            if actual_col_name is None:
-                print(f"Warning: Column '{col_name}' not found in DataFrame. Available columns: {df.columns.tolist()}")
-                continue
-            
-            if col_type == 'date':
-                df[output_name] = pd.to_datetime(df[actual_col_name])
-            
-            elif col_type == 'numeric':
-                if col_config['data_type'] == 'int':
-                    df[output_name] = pd.to_numeric(df[actual_col_name], errors='coerce').astype('Int64')
-                else:  # float
-                    df[output_name] = pd.to_numeric(df[actual_col_name], errors='coerce')
-            
-            elif col_type == 'json':
-                if 'keys' in col_config:
-                    # Extract specific keys from JSON
-                    for key_config in col_config['keys']:
-                        # Handle both string and dictionary key configurations
-                        if isinstance(key_config, str):
-                            key_path = key_config
-                            new_col_name = f"{output_name}_{key_path.replace('.', '_')}"
-                        else:
-                            key_path = key_config['path']
-                            new_col_name = key_config.get('output_name', f"{output_name}_{key_path.replace('.', '_')}")
-                        
-                        df[new_col_name] = df[actual_col_name].apply(
-                            lambda x: get_nested_value(json.loads(x), key_path) if x else None
-                        )
-                    # Drop the original JSON column
-                    df = df.drop(columns=[actual_col_name])
-            
-            elif col_type == 'string':
-                df[output_name] = df[actual_col_name]
-            
-            # If output name is different from input name, drop the original column
-            if output_name != actual_col_name and col_type != 'json':
-                df = df.drop(columns=[actual_col_name])
+        elif col_type == 'json':
+            # JSON column without keys is kept as raw text
+            result[actual_col_name] = df[actual_col_name]
         
-        # Print final DataFrame info
-        print("\nFinal DataFrame info:")
-        print("Columns:", df.columns.tolist())
-        print("Shape:", df.shape)
+        else:  # string
+            if STRING_DTYPE is not None:
+                result[output_name] = df[actual_col_name].astype(STRING_DTYPE)
+            else:
+                result[output_name] = df[actual_col_name]
+    
+    for date_format, column_pairs in date_groups.items():
+        result.update(convert_columns(df, column_pairs, pd.to_datetime, format=date_format))
+    result.update(convert_columns(df, int_columns, pd.to_numeric, dtype='Int64', errors='coerce'))
+    result.update(convert_columns(df, float_columns, pd.to_numeric, errors='coerce'))
+    
+    df = pd.DataFrame(result, index=df.index)
+    
+    # Log final DataFrame info
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final DataFrame columns: %s", df.columns.tolist())
+        logger.debug("Final DataFrame shape: %s", df.shape)
         if not df.empty:
-            print("\nFirst few rows of processed data:")
-            print(df.head())
-        
-        return df
-        
-    finally:
-        connection.close()
+            logger.debug("First few rows of processed data:\n%s", df.head())
+    
+    return df
 
-def extract(config: Union[str, Dict]) -> pd.DataFrame:
+def extract(config: Union[str, Dict, ExtractConfig]) -> pd.DataFrame:
     """
     Extract data from the specified source based on configuration.
     
     Args:
-        config: Either a JSON string or dictionary containing extraction configuration
+        config: A JSON string, dictionary or parsed ExtractConfig containing extraction configuration
     
     Returns:
         pd.DataFrame: Extracted data as a pandas DataFrame
@@ -288,7 +397,11 @@ def extract(config: Union[str, Dict]) -> pd.DataFrame:
     if isinstance(config, str):
         config = json.loads(config)
     
-    source_type = config['source']['type']
+    # Parse the configuration once unless the caller already did
+    if not isinstance(config, ExtractConfig):
+        config = ExtractConfig.from_dict(config)
+    
+    source_type = config.source['type']
     
     if source_type == 'mysql':
         return extract_from_mysql(config)
@@ -1,8 +1,163 @@
 import boto3
-from typing import Dict, Union
+from boto3.s3.transfer import TransferConfig
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, Union
+import io
 import json
 import os
+import shutil
 from pathlib import Path
+from transform.restructureEngine import dumps_json
+
+# Multipart settings used for every S3 upload
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True
+)
+
+# Minimum size of each streamed CSV part (S3 requires at least 5MB except for the last part)
+S3_PART_SIZE = 16 * 1024 * 1024
+
+# Number of CSV parts uploaded concurrently while the next ones are serialized
+S3_UPLOAD_WORKERS = 8
+
+# Default number of rows serialized at a time when streaming CSV to S3
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Local directories already created during this process
+_created_directories = set()
+
+# S3 clients cached per (access key, region) so their connection pools are reused
+_s3_clients = {}
+
+def get_s3_client(s3_config: Dict):
+    """
+    Get the S3 client for the destination configuration, creating it on first use.
+    
+    Args:
+        s3_config: Dictionary containing S3 credentials and region
+    
+    Returns:
+        boto3 S3 client
+    """
+    region = s3_config.get('region', 'us-east-1')
+    client_key = (s3_config['aws_access_key_id'], region)
+    s3_client = _s3_clients.get(client_key)
+    if s3_client is None:
+        s3_client = boto3.client(
+            's3',
+            aws_access_key_id=s3_config['aws_access_key_id'],
+            aws_secret_access_key=s3_config['aws_secret_access_key'],
+            region_name=region
+        )
+        _s3_clients[client_key] = s3_client
+    return s3_client
+
+def ensure_directory(directory: str) -> None:
+    """
+    Create a directory if it doesn't exist, skipping directories created earlier.
+    
+    Args:
+        directory: Path of the directory to create
+    """
+    if not directory or directory in _created_directories:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _created_directories.add(directory)
+
+def write_dataframe(df: pd.DataFrame, file_format: str, target: Union[str, io.BytesIO]) -> None:
+    """
+    Serialize a dataframe to a file path or binary buffer.
+    
+    Args:
+        df: DataFrame to serialize
+        file_format: Output format ('csv', 'json' or 'parquet')
+        target: File path or binary buffer to write to
+    """
+    if file_format == 'parquet':
+        df.to_parquet(target, compression='snappy', index=False)
+    elif file_format == 'csv':
+        df.to_csv(target, index=False)
+    elif file_format == 'json':
+        # to_json keeps only 10 significant digits, so serialize the records exactly
+        data = dumps_json(df.to_dict(orient='records')).encode('utf-8')
+        if isinstance(target, str):
+            with open(target, 'wb') as f:
+                f.write(data)
+        else:
+            target.write(data)
+    else:
+        raise ValueError(f"Unsupported load format: {file_format}")
+
+def iter_csv_parts(df: pd.DataFrame, chunk_rows: int) -> Iterator[bytes]:
+    """
+    Serialize a dataframe to CSV in row chunks, grouped into S3 sized parts.
+    
+    Args:
+        df: DataFrame to serialize
+        chunk_rows: Number of rows encoded per to_csv call
+    
+    Yields:
+        bytes: CSV parts of at least S3_PART_SIZE bytes, except for the last one
+    """
+    if df.empty:
+        yield df.to_csv(index=False).encode('utf-8')
+        return
+    
+    part = bytearray()
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        part += chunk.to_csv(index=False, header=(start == 0)).encode('utf-8')
+        if len(part) >= S3_PART_SIZE:
+            yield bytes(part)
+            part = bytearray()
+    
+    if part:
+        yield bytes(part)
+
+def upload_csv_multipart(df: pd.DataFrame, s3_client, bucket: str, key: str,
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """
+    Stream a dataframe to S3 as CSV using a multipart upload.
+    
+    Parts are serialized on the calling thread while earlier parts are being
+    uploaded by a thread pool, so CSV encoding and network transfer overlap.
+    
+    Args:
+        df: DataFrame to upload
+        s3_client: boto3 S3 client
+        bucket: Destination bucket name
+        key: Destination object key
+        chunk_rows: Number of rows encoded per to_csv call
+    """
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key)['UploadId']
+    
+    def upload_part(part_number: int, body: bytes) -> Dict:
+        response = s3_client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                         PartNumber=part_number, Body=body)
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+    
+    try:
+        with ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS) as executor:
+            futures = []
+            pending = set()
+            for part_number, body in enumerate(iter_csv_parts(df, chunk_rows), start=1):
+                # Bound the number of serialized parts held in memory
+                if len(pending) >= S3_UPLOAD_WORKERS:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                future = executor.submit(upload_part, part_number, body)
+                futures.append(future)
+                pending.add(future)
+            parts = [future.result() for future in futures]
+        
+        s3_client.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id,
+                                            MultipartUpload={'Parts': parts})
+    except Exception:
+        s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
 
 def load_to_s3(file_path: str, config: Dict) -> None:
     """
@@ -15,12 +170,7 @@ def load_to_s3(file_path: str, config: Dict) -> None:
     s3_config = config['destination']
     
     # Initialize S3 client
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=s3_config['aws_access_key_id'],
-        aws_secret_access_key=s3_config['aws_secret_access_key'],
-        region_name=s3_config.get('region', 'us-east-1')
-    )
+    s3_client = get_s3_client(s3_config)
     
     # Upload to S3
     bucket_name = s3_config['bucket']
@@ -29,7 +179,8 @@ def load_to_s3(file_path: str, config: Dict) -> None:
     s3_client.upload_file(
         file_path,
         bucket_name,
-        s3_key
+        s3_key,
+        Config=S3_TRANSFER_CONFIG
     )
 
 def load_to_local(file_path: str, config: Dict) -> None:
@@ -44,12 +195,48 @@ def load_to_local(file_path: str, config: Dict) -> None:
     destination_path = local_config['path']
     
     # Create directory if it doesn't exist
-    directory = os.path.dirname(destination_path)
-    if directory:
-        os.makedirs(directory, exist_ok=True)
+    ensure_directory(os.path.dirname(destination_path))
+    
+    # Move the file, copying it when the destination is on another filesystem
+    shutil.move(file_path, destination_path)
+
+def load_dataframe(df: pd.DataFrame, config: Union[str, Dict]) -> None:
+    """
+    Load a dataframe to the specified destination without a local staging file.
+    
+    The dataframe is serialized using config['format'] and streamed straight
+    to S3, or written directly to the local destination path. CSV is
+    uploaded to S3 in parts of config['chunk_rows'] rows while it is encoded.
+    
+    Args:
+        df: DataFrame to be loaded
+        config: Either a JSON string or dictionary containing load configuration
+    """
+    # Convert string to dict if JSON string is provided
+    if isinstance(config, str):
+        config = json.loads(config)
     
-    # Move the file
-    os.rename(file_path, destination_path)
+    destination = config['destination']
+    destination_type = destination['type']
+    file_format = config.get('format', 'csv')
+    
+    if destination_type == 's3':
+        s3_client = get_s3_client(destination)
+        if file_format == 'csv':
+            # Overlap CSV encoding with the upload instead of buffering the whole file
+            upload_csv_multipart(df, s3_client, destination['bucket'], destination['key'],
+                                 config.get('chunk_rows', DEFAULT_CHUNK_ROWS))
+        else:
+            buffer = io.BytesIO()
+            write_dataframe(df, file_format, buffer)
+            buffer.seek(0)
+            s3_client.upload_fileobj(buffer, destination['bucket'], destination['key'],
+                                     Config=S3_TRANSFER_CONFIG)
+    elif destination_type == 'local':
+        ensure_directory(os.path.dirname(destination['path']))
+        write_dataframe(df, file_format, destination['path'])
+    else:
+        raise ValueError(f"Unsupported destination type: {destination_type}")
 
 def load(file_path: str, config: Union[str, Dict]) -> None:
     """
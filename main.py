@@ -2,11 +2,18 @@ import json
 import sys
 from pathlib import Path
 from extract.sourceEngine import extract
+from extract.extractConfig import ExtractConfig
 from transform.transformEngine import transform, set_dataframe
 from transform.restructureEngine import restructure
-from load.loadEngine import load
+from load.loadEngine import load, load_dataframe
 import pandas as pd
 
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    json_loads = json.loads
+
 def run_etl(config_file: str) -> None:
     """
     Run the ETL process based on the configuration file.
@@ -15,34 +22,47 @@ def run_etl(config_file: str) -> None:
         config_file: Path to the JSON configuration file
     """
     # Read and parse the configuration file
-    with open(config_file, 'r') as f:
-        config = json.load(f)
+    with open(config_file, 'rb') as f:
+        config = json_loads(f.read())
+    
+    # Validate the extract settings once up front
+    extract_config = ExtractConfig.from_dict(config['extract'])
     
     try:
         # Extract phase
         print("Starting Extract phase...")
-        df = extract(config['extract'])
+        df = extract(extract_config)
         print("Extract phase completed successfully.")
         print(df.head())
         # Set the dataframe for transform
-        set_dataframe(df)
+        context = set_dataframe(df)
         
         # Transform phase
         if 'transform' in config:
             print("Starting Transform phase...")
-            df = transform(config['transform'])
+            df = transform(context, config['transform'])
             print("Transform phase completed successfully.")
         
         # Restructure phase
         if 'restructure' in config:
             print("Starting Restructure phase...")
-            df = restructure(config['restructure'])
+            restructure_config = config['restructure']
+            if 'format' in config['load']:
+                # The load phase serializes the dataframe itself, so don't write output_path too
+                restructure_config = {key: value for key, value in restructure_config.items()
+                                      if key != 'output_path'}
+                restructure_config['format'] = 'dataframe'
+            df = restructure(context, restructure_config)
             print("Restructure phase completed successfully.")
         
         # Load phase
         print("Starting Load phase...")
-        output_path = config['restructure']['output_path']
-        load(output_path, config['load'])
+        if 'format' in config['load']:
+            # Serialize the dataframe and load it directly
+            load_dataframe(df, config['load'])
+        else:
+            output_path = config['restructure']['output_path']
+            load(output_path, config['load'])
         print("Load phase completed successfully.")
         
         print("ETL process completed successfully!")
@@ -17,6 +17,7 @@ fake = Faker()
 
 # ---- CONNECT TO MYSQL ----
 conn = mysql.connector.connect(**DB_CONFIG)
+conn.autocommit = False
 cursor = conn.cursor()
 
 # ---- SQL INSERT TEMPLATE ----
@@ -25,7 +26,8 @@ INSERT INTO BillEvent (event_id, SKU_id, AccountSID, `From`, `To`, Description)
 VALUES (%s, %s, %s, %s, %s, %s)
 """
 
-# ---- GENERATE AND INSERT 100 ROWS ----
+# ---- GENERATE 100 ROWS ----
+rows = []
 for _ in range(100):
     event_id = f"E{random.randint(1000, 9999)}"
     sku_id = f"SKU{random.randint(1000, 9999)}"
@@ -41,16 +43,18 @@ for _ in range(100):
         "notes": fake.sentence()
     }
 
-    # Insert into DB
-    values = (
+    rows.append((
         event_id,
         sku_id,
         account_sid,
         start_time,
         end_time,
         json.dumps(description)
-    )
-    cursor.execute(insert_query, values)
+    ))
+
+# ---- INSERT ALL ROWS ----
+# executemany rewrites the rows into a single multi-row INSERT
+cursor.executemany(insert_query, rows)
 
 # ---- COMMIT AND CLOSE ----
 conn.commit()
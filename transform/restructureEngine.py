@@ -1,25 +1,160 @@
 import pandas as pd
-from typing import Dict, Union, List
+from typing import Dict, Iterable, Iterator, Optional, Union, List
 import json
 from pathlib import Path
 from datetime import datetime
+from .transformEngine import TransformContext
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional, fall back to the pandas/Python writers
+    pa = None
+    pacsv = None
 
 def datetime_handler(obj):
     if isinstance(obj, (pd.Timestamp, datetime)):
         return obj.isoformat()
+    if obj is pd.NA:
+        return None
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
-def restructure(export_config: Union[str, Dict]) -> Union[pd.DataFrame, Dict, str]:
+def dumps_json(data: List[Dict]) -> str:
+    """
+    Serialize JSON records as an indented array, using orjson when it is installed.
+    
+    Floats are written with their shortest exact representation, so they round-trip:
+    
+    >>> json.loads(dumps_json([{'x': 0.123456789012345, 'y': 1 / 3}])) == [{'x': 0.123456789012345, 'y': 1 / 3}]
+    True
+    
+    Args:
+        data: Records to serialize
+    
+    Returns:
+        str: JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=datetime_handler,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, default=datetime_handler)
+
+def iter_row_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Split a dataframe into consecutive row slices.
+    
+    Args:
+        df: DataFrame to split
+        chunk_rows: Maximum number of rows per slice
+    
+    Yields:
+        pd.DataFrame: Row slices, or the empty dataframe itself if it has no rows
+    """
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def write_csv(df: pd.DataFrame, output_path: str, chunk_rows: int, engine: str = 'pandas') -> None:
+    """
+    Write a dataframe to CSV in row chunks.
+    
+    With engine 'pyarrow' (and pyarrow installed) Arrow formats each chunk with
+    multithreaded vectorized kernels. Its output differs from pandas: headers
+    and strings are quoted, booleans are lower case, whole floats lose the
+    trailing '.0' and timestamps keep their full precision. Frames Arrow can't
+    convert (e.g. mixed object columns) are written with pandas.
+    
+    Args:
+        df: DataFrame to write
+        output_path: Path of the output file
+        chunk_rows: Maximum number of rows converted and written at a time
+        engine: 'pandas' or 'pyarrow'
+    """
+    if engine == 'pyarrow' and pacsv is not None:
+        try:
+            schema = None
+            writer = None
+            try:
+                for chunk in iter_row_chunks(df, chunk_rows):
+                    table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                    if writer is None:
+                        schema = table.schema
+                        writer = pacsv.CSVWriter(output_path, schema)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            return
+        except pa.ArrowException:
+            pass  # rewrite the whole file with pandas below
+    
+    with open(output_path, 'w', newline='') as f:
+        for start, chunk in enumerate(iter_row_chunks(df, chunk_rows)):
+            chunk.to_csv(f, index=False, header=(start == 0))
+
+def write_json_array(fragments: Iterable[str], output_path: str) -> None:
+    """
+    Write several JSON array texts to a file as one array.
+    
+    Args:
+        fragments: Indented JSON array texts, one per chunk of records
+        output_path: Path of the output file
+    """
+    with open(output_path, 'w') as f:
+        f.write('[')
+        first = True
+        for text in fragments:
+            # Strip the enclosing brackets and join the records of each chunk
+            body = text.strip()[1:-1].strip('\n')
+            if not body.strip():
+                continue
+            f.write('\n' if first else ',\n')
+            f.write(body)
+            first = False
+        f.write(']' if first else '\n]')
+
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast float and integer columns to the smallest dtype holding their values.
+    
+    Float columns are only narrowed when every value survives the round trip unchanged.
+    
+    Args:
+        df: DataFrame to downcast
+    
+    Returns:
+        pd.DataFrame: New dataframe with narrowed numeric columns
+    """
+    downcast = {}
+    for column in df.select_dtypes('float').columns:
+        narrowed = pd.to_numeric(df[column], downcast='float')
+        # to_numeric accepts float32 within a tolerance, which would round the exported values
+        if narrowed.astype(df[column].dtype).equals(df[column]):
+            downcast[column] = narrowed
+    for column in df.select_dtypes('integer').columns:
+        downcast[column] = pd.to_numeric(df[column], downcast='integer')
+    return df.assign(**downcast)
+
+def restructure(context: TransformContext, export_config: Union[str, Dict]) -> Union[pd.DataFrame, Dict, str]:
     """
-    Restructure and export the global dataframe according to the provided configuration.
+    Restructure and export the context dataframe according to the provided configuration.
     
     Args:
+        context: Context holding the dataframe to export
         export_config: Either a JSON string or dictionary containing export configuration
     
     Returns:
-        The restructured data in the specified format
+        The restructured data in the specified format. JSON written to
+        output_path returns the exported dataframe instead of a list of records.
     """
-    from .transformEngine import df  # Import the global dataframe
+    df = context.df
     
     if df is None:
         raise ValueError("No dataframe available. Please set the dataframe first.")
@@ -31,39 +166,65 @@ def restructure(export_config: Union[str, Dict]) -> Union[pd.DataFrame, Dict, st
     export_format = export_config.get('format', 'dataframe')
     output_path = export_config.get('output_path')
     
-    # Initialize df_export with the full dataframe
-    df_export = df.copy()
+    # Files are written in row chunks to cap peak memory
+    chunk_rows = export_config.get('chunk_rows', 1_000_000)
+    
+    # Export the full dataframe by reference, the writers below don't mutate it
+    df_export = df
     
     # Handle column selection and renaming
     columns_config = export_config.get('columns', {})
     if columns_config:
         # If columns is a list, just select those columns
         if isinstance(columns_config, list):
-            df_export = df[columns_config]
+            df_export = df.loc[:, columns_config]
         # If columns is a dict, rename columns while selecting
         elif isinstance(columns_config, dict):
-            df_export = df[list(columns_config.keys())].rename(columns=columns_config)
+            keys = list(columns_config)
+            df_export = df.loc[:, keys]
+            # Relabel the projection in place instead of copying it again with rename
+            df_export.columns = [columns_config[k] for k in keys]
+    
+    # Narrow numeric columns so the writers below have fewer bytes to encode
+    if export_config.get('downcast', False):
+        df_export = downcast_numeric(df_export)
     
     # Handle JSON structure configuration
     json_structure = export_config.get('json_structure')
     
     if export_format == 'json':
+        if output_path:
+            chunks = iter_row_chunks(df_export, chunk_rows)
+            if json_structure:
+                # Convert to structured JSON format one slice at a time
+                fragments = (dumps_json(convert_to_structured_json(chunk, json_structure))
+                             for chunk in chunks)
+            else:
+                # to_json keeps only 10 significant digits, so serialize the records exactly
+                fragments = (dumps_json(chunk.to_dict(orient='records')) for chunk in chunks)
+            write_json_array(fragments, output_path)
+            return df_export
+        
         if json_structure:
             # Convert to structured JSON format
-            result = convert_to_structured_json(df_export, json_structure)
-        else:
-            # Convert to simple JSON (list of records)
-            result = df_export.to_dict(orient='records')
-            
-        # Write to file if output_path is provided
-        if output_path:
-            with open(output_path, 'w') as f:
-                json.dump(result, f, indent=2, default=datetime_handler)
-        return result
+            return convert_to_structured_json(df_export, json_structure)
+        # Convert to simple JSON (list of records)
+        return df_export.to_dict(orient='records')
         
     elif export_format == 'csv':
         if output_path:
-            df_export.to_csv(output_path, index=False)
+            write_csv(df_export, output_path, chunk_rows, export_config.get('engine', 'pandas'))
+        return df_export
+        
+    elif export_format == 'parquet':
+        if output_path:
+            df_export.to_parquet(output_path, engine='pyarrow',
+                                 compression=export_config.get('compression', 'zstd'), index=False)
+        return df_export
+        
+    elif export_format == 'feather':
+        if output_path:
+            df_export.reset_index(drop=True).to_feather(output_path)
         return df_export
         
     elif export_format == 'excel':
@@ -72,6 +233,9 @@ def restructure(export_config: Union[str, Dict]) -> Union[pd.DataFrame, Dict, st
         return df_export
         
     else:  # dataframe
+        # Callers that mutate the result can ask for a private copy
+        if export_config.get('copy', False):
+            df_export = df_export.copy()
         return df_export
 
 def convert_to_structured_json(df: pd.DataFrame, structure: Dict) -> List[Dict]:
@@ -85,27 +249,71 @@ def convert_to_structured_json(df: pd.DataFrame, structure: Dict) -> List[Dict]:
     Returns:
         List of dictionaries containing the structured JSON
     """
-    result = []
+    # Resolve the requested fields against the dataframe once
+    root_fields = [f for f in structure.get('root', []) if f in df.columns]
+    nested_spec = {
+        nested_key: [f for f in nested_fields if f in df.columns]
+        for nested_key, nested_fields in structure.get('nested', {}).items()
+    }
     
-    for _, row in df.iterrows():
-        item = {}
-        
+    # Convert all needed columns to records in a single pass
+    all_fields = list(dict.fromkeys(root_fields + [f for fields in nested_spec.values() for f in fields]))
+    if not all_fields:
+        return [{} for _ in range(len(df))]
+    
+    if pa is not None:
+        try:
+            records = structured_records_from_arrow(df[all_fields], root_fields, nested_spec)
+            if records is not None:
+                return records
+        except pa.ArrowException:
+            pass  # columns Arrow can't type (e.g. mixed objects) use the Python path
+    
+    records = df[all_fields].to_dict(orient='records')
+    
+    result = []
+    for record in records:
         # Handle root level fields
-        if 'root' in structure:
-            for field in structure['root']:
-                if field in df.columns:
-                    item[field] = row[field]
+        item = {field: record[field] for field in root_fields}
         
         # Handle nested fields
-        if 'nested' in structure:
-            for nested_key, nested_fields in structure['nested'].items():
-                nested_data = {}
-                for field in nested_fields:
-                    if field in df.columns:
-                        nested_data[field] = row[field]
-                if nested_data:  # Only add if there are fields
-                    item[nested_key] = nested_data
+        for nested_key, nested_fields in nested_spec.items():
+            if nested_fields:  # Only add if there are fields
+                item[nested_key] = {field: record[field] for field in nested_fields}
         
         result.append(item)
     
     return result
+
+def structured_records_from_arrow(df: pd.DataFrame, root_fields: List[str],
+                                  nested_spec: Dict[str, List[str]]) -> Optional[List[Dict]]:
+    """
+    Build structured JSON records with Arrow, nesting fields as struct columns.
+    
+    Columns holding dicts or lists are not converted: Arrow infers one struct
+    schema across all rows, which would add missing keys to every value.
+    
+    Args:
+        df: DataFrame holding all root and nested fields
+        root_fields: Fields placed at the root of each record
+        nested_spec: Mapping of nested keys to the fields grouped under them
+    
+    Returns:
+        List of dictionaries containing the structured JSON, or None when a
+        column holds nested values
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if any(pa.types.is_nested(column_type) for column_type in table.schema.types):
+        return None
+    
+    arrays = [table.column(field).combine_chunks() for field in root_fields]
+    names = list(root_fields)
+    for nested_key, nested_fields in nested_spec.items():
+        if nested_fields:  # Only add if there are fields
+            arrays.append(pa.StructArray.from_arrays(
+                [table.column(field).combine_chunks() for field in nested_fields],
+                names=nested_fields
+            ))
+            names.append(nested_key)
+    
+    return pa.Table.from_arrays(arrays, names=names).to_pylist()
@@ -1,153 +1,582 @@
 import pandas as pd
+import numpy as np
 from typing import Dict, List, Union
 import json
+import copy
+import functools
 import importlib.util
+import operator
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Global variable to store the dataframe
-df = None
+try:
+    import numexpr
+except ImportError:  # numexpr is optional, fall back to pandas operators
+    numexpr = None
 
-def set_dataframe(dataframe: pd.DataFrame) -> None:
-    """Set the global dataframe that will be transformed."""
-    global df
-    df = dataframe
+# Arithmetic operations mapped to their expression symbol, Python operator and numpy ufunc
+ARITHMETIC_OPERATIONS = {
+    'add': ('+', operator.add, np.add),
+    'multiply': ('*', operator.mul, np.multiply),
+    'subtract': ('-', operator.sub, np.subtract),
+    'divide': ('/', operator.truediv, np.divide),
+}
 
-def load_custom_module(file_path: str):
+# Column dtypes numexpr evaluates natively; it would silently cast any other dtype
+NUMEXPR_DTYPES = {np.dtype(np.int32), np.dtype(np.int64), np.dtype(np.float32), np.dtype(np.float64)}
+
+# Filter operators mapped to a function building the row mask
+FILTER_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+    'contains': lambda series, value: series.str.contains(value, na=False),
+    'starts_with': lambda series, value: series.str.startswith(value, na=False),
+    'ends_with': lambda series, value: series.str.endswith(value, na=False),
+}
+
+# Maximum number of compiled transform plans kept, keyed by configuration JSON
+PLAN_CACHE_SIZE = 64
+
+# Compiled transform plans, oldest first
+_compiled_plans = {}
+
+class TransformContext:
+    """Holds the dataframe of one pipeline, so pipelines can run independently."""
+    __slots__ = ('df',)
+    
+    def __init__(self, df: pd.DataFrame = None):
+        self.df = df
+
+def set_dataframe(dataframe: Union[pd.DataFrame, np.ndarray], columns: List[str] = None) -> TransformContext:
     """
-    Dynamically load a Python module from a file path.
+    Create the context holding the dataframe that will be transformed.
+    
+    A row-major 2D ndarray is converted to column-major order first, so each
+    column is a contiguous buffer for the per-column reductions in transform.
     
     Args:
-        file_path: Path to the Python file
+        dataframe: DataFrame, or 2D ndarray of values
+        columns: Column names when an ndarray is given
+    
+    Returns:
+        TransformContext: Context to pass to transform and restructure
+    """
+    if isinstance(dataframe, np.ndarray) and dataframe.ndim == 2 and dataframe.flags['C_CONTIGUOUS']:
+        dataframe = pd.DataFrame(np.asfortranarray(dataframe), columns=columns)
+    elif isinstance(dataframe, np.ndarray):
+        dataframe = pd.DataFrame(dataframe, columns=columns)
+    return TransformContext(dataframe)
+
+@functools.lru_cache(maxsize=64)
+def _load_cached_module(file_path: str, mtime_ns: int):
+    """
+    Load a Python module from an absolute file path, cached per file version.
+    
+    Args:
+        file_path: Absolute path to the Python file
+        mtime_ns: Modification time of the file, so edited files are reloaded
         
     Returns:
         module: The loaded Python module
     """
-    # Convert to absolute path if relative
-    if not Path(file_path).is_absolute():
-        file_path = str(Path.cwd() / file_path)
-    
-    # Load the module
-    spec = importlib.util.spec_from_file_location("custom_module", file_path)
+    # Register each file under its own name so different modules don't clobber each other
+    module_name = f"custom_module_{abs(hash(file_path))}"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
     if spec is None:
         raise ValueError(f"Could not load module from {file_path}")
     
     module = importlib.util.module_from_spec(spec)
-    sys.modules["custom_module"] = module
+    sys.modules[module_name] = module
     spec.loader.exec_module(module)
     return module
 
-def transform(transform_config: Union[str, Dict]) -> pd.DataFrame:
+def load_custom_module(file_path: str):
+    """
+    Dynamically load a Python module from a file path.
+    
+    The module is executed once and reused until the file changes.
+    
+    Args:
+        file_path: Path to the Python file
+        
+    Returns:
+        module: The loaded Python module
+    """
+    # Convert to absolute path if relative
+    path = Path(file_path).resolve()
+    return _load_cached_module(str(path), path.stat().st_mtime_ns)
+
+def evaluate_arithmetic(left: pd.Series, right: pd.Series, operation: str,
+                        out: np.ndarray = None):
+    """
+    Apply an arithmetic operation to two columns of the same dataframe.
+    
+    int32, int64, float32 and float64 columns are evaluated with numexpr when it
+    is installed, which works through the arrays in cache-sized blocks on
+    multiple threads. Without numexpr, float64 columns use the numpy ufunc
+    directly. Other dtypes (unsigned or small integers, dates, nullable
+    integers, objects) use the pandas operators.
+    
+    Args:
+        left: Left operand column
+        right: Right operand column
+        operation: One of 'add', 'multiply', 'subtract' or 'divide'
+        out: Optional float64 buffer to write the result into when both operands are float64
+        
+    Returns:
+        The result as an ndarray or Series aligned with the operands
+    """
+    symbol, func, ufunc = ARITHMETIC_OPERATIONS[operation]
+    if not (is_numexpr_dtype(left) and is_numexpr_dtype(right)):
+        return func(left, right)
+    
+    a = left.to_numpy()
+    b = right.to_numpy()
+    is_float64 = a.dtype == np.float64 and b.dtype == np.float64
+    
+    if numexpr is not None:
+        return numexpr.evaluate(f"a {symbol} b", local_dict={'a': a, 'b': b},
+                                out=out if is_float64 else None)
+    
+    if is_float64:
+        if out is None:
+            out = np.empty_like(a)
+        # Match pandas: division by zero gives inf/nan without a RuntimeWarning
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return ufunc(a, b, out=out)
+    
+    return func(left, right)
+
+def get_reusable_buffer(df: pd.DataFrame, column: str, buffers: Dict):
+    """
+    Get the float64 buffer backing a column written earlier in the same transform.
+    
+    Only buffers the engine allocated itself are reused, so arrays shared with the
+    caller (an input ndarray, or views of the input dataframe) are never overwritten.
+    
+    Args:
+        df: Dataframe holding the column
+        column: Name of the column about to be overwritten
+        buffers: Column buffers assigned by this transform, keyed by column name
+        
+    Returns:
+        The column's ndarray when it is still an engine-owned writable buffer, otherwise None
+    """
+    owned = buffers.get(column)
+    if owned is None or column not in df.columns:
+        return None
+    values = df[column].to_numpy()
+    if (values.ndim == 1 and values.dtype == np.float64
+            and values.flags.writeable and np.shares_memory(values, owned)):
+        return values
+    return None
+
+def is_numexpr_dtype(series: pd.Series) -> bool:
+    """Check whether a column is backed by a numpy array of a dtype numexpr supports."""
+    return isinstance(series.dtype, np.dtype) and series.dtype in NUMEXPR_DTYPES
+
+def is_broadcast_aggregate(step: Dict) -> bool:
+    """Check whether a transformation adds a group aggregate column to every row."""
+    return step['type'] == 'aggregate' and step.get('broadcast', False)
+
+def is_column_step(step: Union[Dict, List[Dict]]) -> bool:
+    """Check whether a planned step only adds a column, keeping the rows unchanged."""
+    if isinstance(step, list):
+        return True
+    return step['type'] in ('arithmetic', 'custom_file') or is_broadcast_aggregate(step)
+
+def get_step_columns(step: Union[Dict, List[Dict]]) -> tuple:
+    """
+    Get the columns a column-adding step reads and writes.
+    
+    Args:
+        step: Arithmetic, custom_file or broadcast aggregate transformation,
+            or a group of fused broadcast aggregates
+        
+    Returns:
+        Tuple of (set of columns read, set of columns written)
+    """
+    reads = set()
+    writes = set()
+    for item in (step if isinstance(step, list) else [step]):
+        reads.update(item.get('columns', []))
+        if item['type'] == 'aggregate':
+            reads.update(item.get('group_by', []))
+        writes.add(item.get('output_column'))
+    return reads, writes
+
+def plan_transformations(transformations: List[Dict]) -> List[Union[Dict, List[Dict]]]:
+    """
+    Reorder transformations so broadcast aggregates run first where it is safe.
+    
+    Filters and row-collapsing aggregates change the rows every later step sees,
+    so they keep their position and split the pipeline into segments. Within a
+    segment, broadcast aggregates that don't depend on (or clobber) the columns
+    of earlier steps are hoisted to the front, and hoisted aggregates with the
+    same group_by keys are fused into one group so they share a single groupby.
+    
+    Args:
+        transformations: Transformations in configuration order
+        
+    Returns:
+        Steps to run in order; a list entry is a group of fused broadcast aggregates
+    """
+    plan = []
+    segment = []
+    
+    def flush_segment():
+        hoisted = []
+        remaining = []
+        touched = set()  # columns read or written by steps that stay in place
+        written = set()  # columns written by any earlier step in the segment
+        hoisted_reads = set()  # columns read by hoisted aggregates
+        for step in segment:
+            reads, writes = get_step_columns(step)
+            if (is_broadcast_aggregate(step) and not reads & written
+                    and not writes & (touched | written | hoisted_reads)):
+                hoisted.append(step)
+                hoisted_reads.update(reads)
+            else:
+                remaining.append(step)
+                touched.update(reads | writes)
+            written.update(writes)
+        
+        # Fuse hoisted aggregates by group_by keys, in order of first appearance
+        groups = {}
+        for step in hoisted:
+            groups.setdefault(tuple(step.get('group_by', [])), []).append(step)
+        plan.extend(groups.values())
+        plan.extend(remaining)
+        segment.clear()
+    
+    for step in transformations:
+        if is_column_step(step):
+            segment.append(step)
+        else:
+            flush_segment()
+            plan.append(step)
+    flush_segment()
+    
+    return plan
+
+def group_into_levels(steps: List[Union[Dict, List[Dict]]]) -> List[List[Union[Dict, List[Dict]]]]:
     """
-    Apply transformations to the global dataframe based on the provided configuration.
+    Group column-adding steps into levels of mutually independent steps.
+    
+    A step is placed one level after every earlier step it reads from, or
+    whose inputs or output it overwrites; steps within a level can run in any order.
+    
+    Args:
+        steps: Column-adding steps in execution order
+        
+    Returns:
+        Levels of steps, to be run one level after another
+    """
+    levels = []
+    history = []
+    for step in steps:
+        reads, writes = get_step_columns(step)
+        level = 0
+        for prev_reads, prev_writes, prev_level in history:
+            if reads & prev_writes or writes & prev_reads or writes & prev_writes:
+                level = max(level, prev_level + 1)
+        history.append((reads, writes, level))
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(step)
+    return levels
+
+def get_groupby(df: pd.DataFrame, group_by: List[str], gb_cache: Dict):
+    """
+    Get a GroupBy over the given keys, reusing one built earlier in the same transform.
+    
+    Rows are not sorted by key since broadcast results are aligned to the index.
     
     Args:
+        df: Dataframe to group
+        group_by: Columns to group by
+        gb_cache: GroupBy objects keyed by tuple(group_by)
+        
+    Returns:
+        DataFrameGroupBy over the keys
+    """
+    key = tuple(group_by)
+    grouped = gb_cache.get(key)
+    if grouped is None:
+        grouped = df.groupby(list(group_by), sort=False, observed=True)
+        gb_cache[key] = grouped
+    return grouped
+
+def compute_step(df: pd.DataFrame, step: Union[Dict, List[Dict]], gb_cache: Dict,
+                 buffers: Dict) -> List[tuple]:
+    """
+    Compute the output columns of a column-adding step without adding them to the dataframe.
+    
+    Args:
+        df: Dataframe to read the input columns from
+        step: Arithmetic, custom_file or broadcast aggregate transformation,
+            or a group of fused broadcast aggregates
+        gb_cache: GroupBy objects shared by the aggregates of this transform
+        buffers: Column buffers assigned by this transform, keyed by column name
+        
+    Returns:
+        List of (output_column, values) tuples
+    """
+    # Fused broadcast aggregates share one groupby over the same keys
+    if isinstance(step, list):
+        grouped = get_groupby(df, step[0].get('group_by', []), gb_cache)
+        return [(item['output_column'], grouped[item['columns'][0]].transform(item['operation']))
+                for item in step if item['operation'] in ('sum', 'mean', 'count')]
+    
+    transform_type = step['type']
+    columns = step['columns']
+    output_column = step['output_column']
+    
+    if transform_type == 'arithmetic':
+        operation = step['operation']
+        if operation in ARITHMETIC_OPERATIONS:
+            # Overwrite a float64 column written earlier in this transform in place instead of allocating
+            out = get_reusable_buffer(df, output_column, buffers)
+            return [(output_column, evaluate_arithmetic(df[columns[0]], df[columns[1]], operation, out))]
+        
+    elif transform_type == 'aggregate':
+        operation = step['operation']
+        if operation in ('sum', 'mean', 'count'):
+            # Add the group aggregate to every row without collapsing or merging
+            grouped = get_groupby(df, step.get('group_by', []), gb_cache)
+            return [(output_column, grouped[columns[0]].transform(operation))]
+        
+    elif transform_type == 'custom_file':
+        file_path = step['file_path']
+        function_name = step['function_name']
+        # Copy so popping options doesn't modify the configuration
+        parameters = dict(step.get('parameters', {}))
+        # array_mode passes numpy arrays instead of Series; the function must
+        # return a 1-D array with one value per row
+        array_mode = parameters.pop('array_mode', False)
+        
+        try:
+            # Load the custom module
+            custom_module = load_custom_module(file_path)
+            
+            # Get the function from the module
+            if not hasattr(custom_module, function_name):
+                raise ValueError(f"Function {function_name} not found in {file_path}")
+            
+            custom_func = getattr(custom_module, function_name)
+            
+            # Apply the function to the columns
+            if array_mode:
+                return [(output_column, custom_func(*[df[col].to_numpy() for col in columns], **parameters))]
+            elif len(columns) == 1:
+                return [(output_column, custom_func(df[columns[0]], **parameters))]
+            else:
+                return [(output_column, custom_func(*[df[col] for col in columns], **parameters))]
+                
+        except Exception as e:
+            raise ValueError(f"Error in custom transformation {function_name} from {file_path}: {str(e)}")
+    
+    return []
+
+def run_column_steps(df: pd.DataFrame, levels: List[List[Union[Dict, List[Dict]]]], gb_cache: Dict,
+                     buffers: Dict) -> None:
+    """
+    Run column-adding steps, computing independent steps in parallel threads.
+    
+    pandas and numexpr release the GIL inside their kernels, so the steps of a
+    level run concurrently. Custom functions must therefore be thread-safe.
+    
+    Args:
+        df: Dataframe updated in place with the output columns
+        levels: Levels of column-adding steps, as returned by group_into_levels
+        gb_cache: GroupBy objects shared by the aggregates of this transform
+        buffers: Column buffers assigned by this transform, updated with the new columns
+    """
+    for level in levels:
+        if len(level) == 1:
+            results = compute_step(df, level[0], gb_cache, buffers)
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(level), os.cpu_count() or 1)) as executor:
+                results = [result for step_results in executor.map(lambda step: compute_step(df, step, gb_cache, buffers), level)
+                           for result in step_results]
+        
+        # Assign on the calling thread so only one thread modifies the dataframe
+        for output_column, values in results:
+            df[output_column] = values
+            # pandas copies assigned values, so the column now has a buffer of its own
+            if df[output_column].dtype == np.float64:
+                buffers[output_column] = df[output_column].to_numpy()
+        
+        # Drop cached groupings whose key columns were just overwritten
+        written = {output_column for output_column, _ in results}
+        for key in [key for key in gb_cache if written.intersection(key)]:
+            del gb_cache[key]
+
+def compile_barrier(step: Dict):
+    """
+    Build a function applying a row-changing step, resolving its settings once.
+    
+    Args:
+        step: Filter or row-collapsing aggregate transformation
+        
+    Returns:
+        Function taking a dataframe and returning the resulting dataframe,
+        or None when the step does nothing
+    """
+    transform_type = step['type']
+    
+    if transform_type == 'aggregate':
+        columns = step['columns']
+        output_column = step['output_column']
+        operation = step['operation']
+        group_by = step.get('group_by', [])
+        if operation in ('sum', 'mean', 'count'):
+            def run_aggregate(df):
+                agg_df = df.groupby(group_by)[columns].agg(operation)
+                agg_df.columns = [output_column]
+                return agg_df.reset_index()
+            return run_aggregate
+        
+    elif transform_type == 'filter':
+        column = step['column']
+        compare = FILTER_OPERATORS.get(step['operator'])
+        value = step['value']
+        value_type = step['value_type']
+        
+        # Convert value to appropriate type
+        if value_type == 'number':
+            value = float(value)
+        elif value_type == 'date':
+            value = pd.to_datetime(value)
+        
+        if compare is not None:
+            return lambda df: df[compare(df[column], value)]
+    
+    return None
+
+def compile_plan(transformations: List[Dict]) -> tuple:
+    """
+    Compile transformations into the stages to run.
+    
+    Planning, level grouping and filter value conversion depend only on the
+    configuration, so transform caches the result per configuration.
+    
+    Args:
+        transformations: Transformations in configuration order
+        
+    Returns:
+        Tuple of stages: a list of levels of column-adding steps, or a barrier
+        function from compile_barrier
+    """
+    
+    stages = []
+    # Column-adding steps are batched until a step that changes the rows
+    column_steps = []
+    for step in plan_transformations(transformations):
+        if is_column_step(step):
+            column_steps.append(step)
+            continue
+        
+        stages.append(group_into_levels(column_steps))
+        column_steps = []
+        barrier = compile_barrier(step)
+        if barrier is not None:
+            stages.append(barrier)
+    stages.append(group_into_levels(column_steps))
+    
+    return tuple(stages)
+
+def restore_column_order(df: pd.DataFrame, transformations: List[Dict], input_columns: set) -> pd.DataFrame:
+    """
+    Put the columns added by column-adding steps back in configuration order.
+    
+    Hoisted broadcast aggregates add their columns before the steps they were
+    moved ahead of, so the added columns are reordered within the positions they occupy.
+    
+    Args:
+        df: Transformed dataframe
+        transformations: Transformations in configuration order
+        input_columns: Columns of the dataframe before the transform
+        
+    Returns:
+        pd.DataFrame: Dataframe with the added columns in configuration order
+    """
+    added = [column for column in dict.fromkeys(step.get('output_column') for step in transformations
+                                                if is_column_step(step))
+             if column in df.columns and column not in input_columns]
+    added_set = set(added)
+    columns = list(df.columns)
+    positions = [position for position, column in enumerate(columns) if column in added_set]
+    if [columns[position] for position in positions] == added:
+        return df
+    
+    for position, column in zip(positions, added):
+        columns[position] = column
+    return df[columns]
+
+def transform(context: TransformContext, transform_config: Union[str, Dict]) -> pd.DataFrame:
+    """
+    Apply transformations to the context dataframe based on the provided configuration.
+    
+    Args:
+        context: Context holding the dataframe, updated with the result
         transform_config: Either a JSON string or dictionary containing transformation rules
     
     Returns:
         pd.DataFrame: Transformed dataframe
     """
-    global df
+    df = context.df
     
     if df is None:
         raise ValueError("No dataframe set. Use set_dataframe() first.")
     
+    input_columns = set(df.columns)
+    
     # Convert string to dict if JSON string is provided
     if isinstance(transform_config, str):
         transform_config = json.loads(transform_config)
     
     transformations = transform_config.get('transformations', [])
     
-    for transform in transformations:
-        transform_type = transform['type']
-        
-        if transform_type == 'arithmetic':
-            columns = transform['columns']
-            output_column = transform['output_column']
-            operation = transform['operation']
-            if operation == 'add':
-                df[output_column] = df[columns[0]] + df[columns[1]]
-            elif operation == 'multiply':
-                df[output_column] = df[columns[0]] * df[columns[1]]
-            elif operation == 'subtract':
-                df[output_column] = df[columns[0]] - df[columns[1]]
-            elif operation == 'divide':
-                df[output_column] = df[columns[0]] / df[columns[1]]
-                
-        elif transform_type == 'aggregate':
-            columns = transform['columns']
-            output_column = transform['output_column']
-            operation = transform['operation']
-            group_by = transform.get('group_by', [])
-            if operation == 'sum':
-                agg_df = df.groupby(group_by)[columns].sum()
-                agg_df.columns = [output_column]
-                df = agg_df.reset_index()
-            elif operation == 'mean':
-                agg_df = df.groupby(group_by)[columns].mean()
-                agg_df.columns = [output_column]
-                df = agg_df.reset_index()
-            elif operation == 'count':
-                agg_df = df.groupby(group_by)[columns].count()
-                agg_df.columns = [output_column]
-                df = agg_df.reset_index()
-                
-        elif transform_type == 'filter':
-            column = transform['column']
-            operator = transform['operator']
-            value = transform['value']
-            value_type = transform['value_type']
-            
-            # Convert value to appropriate type
-            if value_type == 'number':
-                value = float(value)
-            elif value_type == 'date':
-                value = pd.to_datetime(value)
-            
-            # Apply filter based on operator
-            if operator == '>':
-                df = df[df[column] > value]
-            elif operator == '>=':
-                df = df[df[column] >= value]
-            elif operator == '<':
-                df = df[df[column] < value]
-            elif operator == '<=':
-                df = df[df[column] <= value]
-            elif operator == '==':
-                df = df[df[column] == value]
-            elif operator == '!=':
-                df = df[df[column] != value]
-            elif operator == 'contains':
-                df = df[df[column].str.contains(value, na=False)]
-            elif operator == 'starts_with':
-                df = df[df[column].str.startswith(value, na=False)]
-            elif operator == 'ends_with':
-                df = df[df[column].str.endswith(value, na=False)]
-                
-        elif transform_type == 'custom_file':
-            columns = transform['columns']
-            output_column = transform['output_column']
-            file_path = transform['file_path']
-            function_name = transform['function_name']
-            parameters = transform.get('parameters', {})
-            
-            try:
-                # Load the custom module
-                custom_module = load_custom_module(file_path)
-                
-                # Get the function from the module
-                if not hasattr(custom_module, function_name):
-                    raise ValueError(f"Function {function_name} not found in {file_path}")
-                
-                custom_func = getattr(custom_module, function_name)
-                
-                # Apply the function to the columns
-                if len(columns) == 1:
-                    df[output_column] = custom_func(df[columns[0]], **parameters)
-                else:
-                    df[output_column] = custom_func(*[df[col] for col in columns], **parameters)
-                    
-            except Exception as e:
-                raise ValueError(f"Error in custom transformation {function_name} from {file_path}: {str(e)}")
-    
-    return df
\ No newline at end of file
+    # GroupBy objects reused by aggregates over the same keys, until the rows change
+    gb_cache = {}
+    
+    # Buffers of the columns assigned by this transform, reusable until the rows change
+    buffers = {}
+    
+    try:
+        config_key = json.dumps(transform_config, sort_keys=True)
+    except TypeError:
+        config_key = None  # values JSON can't represent (e.g. Timestamps) are planned on every call
+    
+    stages = _compiled_plans.get(config_key) if config_key is not None else None
+    if stages is None:
+        if config_key is None:
+            stages = compile_plan(transformations)
+        else:
+            # Plan a copy, so later changes to the caller's configuration can't alter the cached plan
+            stages = compile_plan(copy.deepcopy(transformations))
+            if len(_compiled_plans) >= PLAN_CACHE_SIZE:
+                _compiled_plans.pop(next(iter(_compiled_plans)), None)
+            _compiled_plans[config_key] = stages
+    
+    for stage in stages:
+        if isinstance(stage, list):
+            run_column_steps(df, stage, gb_cache, buffers)
+        else:
+            df = stage(df)
+            gb_cache.clear()
+            buffers.clear()
+    
+    # Consolidate the blocks created by the added columns into one per dtype
+    if transformations:
+        df = restore_column_order(df, transformations, input_columns).copy()
+    
+    context.df = df
+    return df